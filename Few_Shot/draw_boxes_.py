@@ -1,17 +1,42 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog, ttk
-from PIL import Image, ImageTk
+from PIL import Image, ImageTk, PngImagePlugin
+import numpy as np
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import os
+import copy
+import hashlib
 import json
-from collections import Counter
+import mmap
+import time
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 
 # --- Configuration ---
 IMAGE_DISPLAY_SIZE = (500, 500)
-ANNOTATIONS_FILE = "annotations.json"
+# Preview-only resize; NEAREST is faster still, LANCZOS sharper but much slower.
+DISPLAY_RESAMPLE = Image.Resampling.BILINEAR
+ANNOTATIONS_DIR = "annotations"  # one <subfolder>.json per annotated subfolder
+ANNOTATIONS_FILE = "annotations.json"  # legacy single-file format, migrated on load
+ANNOTATION_INDEX_FILE = "annotation_index.json"  # subfolder -> type_of_annotation
 PROGRESS_FILE = "progress.json"
 ANNOTATION_TYPES_FILE = "annotation_types.json"
+THUMB_CACHE_DIR = ".thumb_cache"  # beside ANNOTATIONS_DIR, one PNG per source image
+THUMB_CACHE_MAX_BYTES = 256 * 1024 * 1024  # ~800 previews; oldest-used pruned at startup
 BBOX_COLOR = "red"
 BBOX_WIDTH = 2
+IMAGE_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg'})
+PHOTO_CACHE_SIZE = 64  # 16 subfolders x 4 images, ~1 MB of Tk pixels each
+SAVE_DEBOUNCE_MS = 500
+
+def _json_default(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 class ExitDialog(tk.Toplevel):
     """Custom dialog for exit confirmation."""
@@ -62,7 +87,9 @@ class AnnotationApp:
         self.subfolders = []
         self.current_subfolder_index = -1
         self.current_subfolder_name = ""
-        self.annotations_data = {}
+        self.annotations_data = {}  # subfolders loaded so far, read lazily from ANNOTATIONS_DIR
+        self.annotation_index = {}
+        self._type_counts = Counter()
         self.progress_data = {}
         self.current_pil_images = [None] * 4
         self.current_photo_images = [None] * 4
@@ -73,6 +100,23 @@ class AnnotationApp:
         self.canvas_drawing_state = {}
         self.undo_stack = []
         self.unsaved_changes = False
+        self._last_drag_time = 0.0
+        self._drag_interval = 1 / 60
+        self._photo_cache = OrderedDict()
+        # Evicted PhotoImages are recycled, so the cache must outlive the 8 images
+        # of the current and previous subfolders that may still be on screen.
+        self._photo_cache_size = max(PHOTO_CACHE_SIZE, 8)
+        self._bbox_max = np.array([IMAGE_DISPLAY_SIZE[0] - 1, IMAGE_DISPLAY_SIZE[1] - 1] * 2, dtype=np.int32)
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=2)
+        self._decode_pool = ThreadPoolExecutor(max_workers=4)
+        self._prefetch_future = None  # (subfolder_name, Future) for the next subfolder
+        self._pending_save_after_id = None
+        self._dirty_files = {}
+        self._file_locks = {path: threading.Lock() for path in (PROGRESS_FILE, ANNOTATION_TYPES_FILE, ANNOTATION_INDEX_FILE)}
+        self._write_generation = 0
+        self._written_generation = {}
+        self._pending_writes = []
+        self._poll_writes_after_id = None
 
         # --- UI Elements ---
         self.image_canvases = []
@@ -82,7 +126,9 @@ class AnnotationApp:
         self.counts_frame = None
         self.annotation_type_combo = None
         self.count_labels = {}
+        self._last_button_states = {}
         self.annotation_types = []
+        self._annotation_types_set = set()  # mirrors annotation_types for membership tests
         self.status_bar_label = tk.Label(self.root, text="Status: Initializing...", bd=1, relief=tk.SUNKEN, anchor=tk.W)
         
         # --- Initialization ---
@@ -140,18 +186,29 @@ class AnnotationApp:
         self.inner_image_grid_frame = tk.Frame(self.overall_canvas)
         self.overall_canvas.create_window((0, 0), window=self.inner_image_grid_frame, anchor="nw")
         self.image_canvases = []
+        self._image_item_ids = []
+        self._displayed_photos = [None] * 4
         for i in range(4):
             row, col = divmod(i, 2)
             canvas = tk.Canvas(self.inner_image_grid_frame, bg="gray", relief=tk.RIDGE, borderwidth=1, width=IMAGE_DISPLAY_SIZE[0], height=IMAGE_DISPLAY_SIZE[1])
             canvas.grid(row=row, column=col, padx=5, pady=5)
             self.image_canvases.append(canvas)
+            self._image_item_ids.append(canvas.create_image(0, 0, anchor=tk.NW, tags="current_image"))
             self.canvas_drawing_state[canvas] = {}
-            canvas.bind("<ButtonPress-1>", lambda event, c=canvas: self._on_canvas_press(event, c))
-            canvas.bind("<B1-Motion>", lambda event, c=canvas: self._on_canvas_drag(event, c))
-            canvas.bind("<ButtonRelease-1>", lambda event, c=canvas: self._on_canvas_release(event, c))
-        scroll_widgets = [self.overall_canvas, self.inner_image_grid_frame] + self.image_canvases
-        for widget in scroll_widgets:
-            widget.bind("<MouseWheel>", self._on_mouse_wheel_scroll)
+            canvas.bind("<ButtonPress-1>", self._on_canvas_press)
+            canvas.bind("<B1-Motion>", self._on_canvas_drag)
+            canvas.bind("<ButtonRelease-1>", self._on_canvas_release)
+        # The grid is a fixed 2x2 of fixed-size canvases, so its scroll region is
+        # computed once here instead of measuring the frame after every load.
+        frame = int(canvas.cget("borderwidth")) + int(canvas.cget("highlightthickness"))
+        cell_w = IMAGE_DISPLAY_SIZE[0] + 2 * frame + 2 * 5
+        cell_h = IMAGE_DISPLAY_SIZE[1] + 2 * frame + 2 * 5
+        self._grid_scrollregion = (0, 0, 2 * cell_w, 2 * cell_h)
+        self.overall_canvas.config(scrollregion=self._grid_scrollregion)
+        self._scroll_widgets = {self.overall_canvas, self.inner_image_grid_frame, *self.image_canvases}
+        self.root.bind_all("<MouseWheel>", self._on_mouse_wheel_scroll)
+        self.root.bind_all("<Button-4>", self._on_mouse_wheel_scroll)
+        self.root.bind_all("<Button-5>", self._on_mouse_wheel_scroll)
 
     def _rebuild_annotation_widgets(self):
         for widget in self.annotation_type_frame.winfo_children():
@@ -167,6 +224,7 @@ class AnnotationApp:
         )
         display_types = [t for t in self.annotation_types if t != 'other']
         self.annotation_type_combo['values'] = display_types
+        self._display_types = tuple(display_types)  # avoids reading 'values' back from Tcl
         if display_types and not self.annotation_type_var.get():
              self.annotation_type_var.set(display_types[0])
         self.annotation_type_combo.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5, pady=5)
@@ -200,7 +258,7 @@ class AnnotationApp:
 
         new_type = new_type.lower().strip()
         
-        if new_type in self.annotation_types:
+        if new_type in self._annotation_types_set:
             self.annotation_type_var.set(new_type)
             messagebox.showinfo("Already Exists", f"The type '{new_type.title()}' already exists. It has been selected for you.")
             return
@@ -218,10 +276,16 @@ class AnnotationApp:
         self._update_status(f"Added new annotation type '{new_type}'. Set as current type.")
 
     def _on_mouse_wheel_scroll(self, event):
+        # Registered with bind_all, so ignore wheel events over other widgets.
+        if event.widget not in self._scroll_widgets: return
+        if event.num in (4, 5):
+            step = -1 if event.num == 4 else 1
+        else:
+            step = -1 * (event.delta // 120)
         if event.state & 0x0001:
-            self.overall_canvas.xview_scroll(-1 * (event.delta // 120), "units")
+            self.overall_canvas.xview_scroll(step, "units")
         else:
-            self.overall_canvas.yview_scroll(-1 * (event.delta // 120), "units")
+            self.overall_canvas.yview_scroll(step, "units")
 
     def _setup_keyboard_shortcuts(self):
         self.root.bind("<Control-s>", lambda event: self._action_save_annotations())
@@ -236,6 +300,7 @@ class AnnotationApp:
         if not self.main_folder_path:
             self.root.destroy()
             return
+        self._prefetch_pool.submit(self._prune_thumb_cache)
         
         self._discover_subfolders()
         if not self.subfolders:
@@ -263,20 +328,24 @@ class AnnotationApp:
 
     def _discover_subfolders(self):
         try:
-            self.subfolders = sorted([d for d in os.listdir(self.main_folder_path) if os.path.isdir(os.path.join(self.main_folder_path, d))])
+            with os.scandir(self.main_folder_path) as it:
+                self.subfolders = sorted(e.name for e in it if e.is_dir())
             self._update_status(f"Found {len(self.subfolders)} subfolders.")
         except Exception as e:
             messagebox.showerror("Error", f"Could not read subfolders: {e}")
 
     def _clear_display_and_current_data(self):
+        # The image item is reused across loads; only the overlays are removed,
+        # including a rectangle still being dragged when the subfolder changes.
         for i, canvas in enumerate(self.image_canvases):
-            canvas.delete("all")
-            canvas.config(bg="gray")
+            canvas.delete("bbox", "placeholder", "drawing")
+            state = self.canvas_drawing_state.get(canvas)
+            if state: state['active_rect_id'] = None
             self.current_photo_images[i] = None
             self.current_pil_images[i] = None
             self.current_image_names[i] = None
         self.drawn_bbox_ids_on_canvas.clear()
-        self.current_subfolder_active_annotations.clear()
+        self.current_subfolder_active_annotations = {}
         self.undo_stack.clear()
         self.unsaved_changes = False
 
@@ -293,67 +362,272 @@ class AnnotationApp:
         completed_status = "(Completed)" if self.current_subfolder_name in self.progress_data.get("completed_subfolders", []) else ""
         self.root.title(f"Annotator - {self.current_subfolder_name} {completed_status} ({idx + 1}/{len(self.subfolders)})")
         
-        image_files = sorted([f for f in os.listdir(full_path) if f.lower().endswith(('.png', '.jpg', '.jpeg'))])
+        image_files = self._list_image_files(full_path)
+        prefetched = self._take_prefetched(idx)
+        self._decode_in_parallel(image_files[:4], prefetched)
 
-        subfolder_data = self.annotations_data.get(self.current_subfolder_name, {})
+        subfolder_data = self._get_subfolder_annotations(self.current_subfolder_name)
         annotation_type = subfolder_data.get("type_of_annotation", self.annotation_type_combo.get())
         
-        combo_values = self.annotation_type_combo['values']
+        combo_values = self._display_types
         if annotation_type not in combo_values:
              annotation_type = combo_values[0] if combo_values else ""
         self.annotation_type_var.set(annotation_type)
 
         for i in range(4):
             if i < len(image_files):
-                img_name = image_files[i]
-                img_path = os.path.join(full_path, img_name)
+                entry = image_files[i]
+                img_name = entry.name
                 canvas = self.image_canvases[i]
                 try:
-                    img = Image.open(img_path).resize(IMAGE_DISPLAY_SIZE, Image.LANCZOS)
+                    img, photo = self._get_photo(entry.path, entry.stat().st_mtime, prefetched)
                     self.current_pil_images[i] = img
-                    self.current_photo_images[i] = ImageTk.PhotoImage(img)
+                    self.current_photo_images[i] = photo
                     self.current_image_names[i] = img_name
-                    canvas.create_image(0, 0, anchor=tk.NW, image=self.current_photo_images[i])
+                    self._show_photo(i, photo)
                     self.canvas_drawing_state[canvas] = {'image_name': img_name}
                     
                     annotations = subfolder_data.get("annotations", {})
-                    self.current_subfolder_active_annotations[img_name] = annotations.get(img_name, []).copy()
-                    self.drawn_bbox_ids_on_canvas[img_name] = []
-                    for bbox in self.current_subfolder_active_annotations[img_name]:
-                        rect_id = canvas.create_rectangle(bbox, outline=BBOX_COLOR, width=BBOX_WIDTH)
-                        self.drawn_bbox_ids_on_canvas[img_name].append(rect_id)
+                    bboxes = np.asarray(annotations.get(img_name, []), dtype=np.int32).reshape(-1, 4)
+                    self.current_subfolder_active_annotations[img_name] = bboxes
+                    self.drawn_bbox_ids_on_canvas[img_name] = self._draw_bboxes(canvas, bboxes)
                 except Exception as e:
-                    canvas.create_text(IMAGE_DISPLAY_SIZE[0]/2, IMAGE_DISPLAY_SIZE[1]/2, text=f"Error loading\n{img_name}", fill="red", justify=tk.CENTER)
+                    self._show_photo(i, None)
+                    self.canvas_drawing_state[canvas] = {}
+                    canvas.create_text(IMAGE_DISPLAY_SIZE[0]/2, IMAGE_DISPLAY_SIZE[1]/2, text=f"Error loading\n{img_name}", fill="red", justify=tk.CENTER, tags="placeholder")
             else:
-                self.image_canvases[i].create_text(IMAGE_DISPLAY_SIZE[0]/2, IMAGE_DISPLAY_SIZE[1]/2, text="No Image", fill="black")
+                self._show_photo(i, None)
+                self.canvas_drawing_state[self.image_canvases[i]] = {}
+                self.image_canvases[i].create_text(IMAGE_DISPLAY_SIZE[0]/2, IMAGE_DISPLAY_SIZE[1]/2, text="No Image", fill="black", tags="placeholder")
         
         self.unsaved_changes = False
         self._update_button_states()
+        if idx + 1 < len(self.subfolders) and not self._prefetch_future:
+            self._prefetch_future = (self.subfolders[idx + 1], self._prefetch_pool.submit(self._prefetch_subfolder, idx + 1))
+
+    def _show_photo(self, i, photo):
+        # Cached PhotoImages keep their identity, so revisiting a subfolder (or
+        # reloading it after a save) leaves an unchanged slot alone.
+        if self._displayed_photos[i] is photo: return
+        self._displayed_photos[i] = photo
+        self.image_canvases[i].itemconfigure(self._image_item_ids[i], image=photo if photo is not None else "")
+
+    def _list_image_files(self, full_path):
+        # Returns DirEntry objects sorted by name. The file type comes from the
+        # directory read and entry.stat() is memoized, so each image is stat'ed
+        # at most once per listing.
+        with os.scandir(full_path) as it:
+            return sorted((e for e in it if e.is_file() and e.name.rpartition('.')[2].lower() in IMAGE_EXTENSIONS), key=lambda e: e.name)
+
+    def _decode_image(self, img_path):
+        img = Image.open(img_path)
+        # Let libjpeg decode at a reduced DCT scale; no-op for other formats.
+        img.draft('RGB', (IMAGE_DISPLAY_SIZE[0] * 2, IMAGE_DISPLAY_SIZE[1] * 2))
+        # PhotoImage is much slower on images with an alpha channel or a palette.
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        # reducing_gap does a cheap box reduce first for large sources draft() can't
+        # shrink (PNGs), so the bilinear pass only sees ~2x the target size.
+        return img.resize(IMAGE_DISPLAY_SIZE, DISPLAY_RESAMPLE, reducing_gap=2.0)
+
+    def _get_thumbnail(self, img_path, mtime):
+        # Resized previews are kept on disk so later sessions skip the resample.
+        # Each source has one fixed entry; the source version and display
+        # settings it was built for are stored in a PNG text chunk.
+        digest = hashlib.sha1(os.path.abspath(img_path).encode('utf-8')).hexdigest()
+        cache_path = os.path.join(THUMB_CACHE_DIR, f"{digest}.png")
+        try:
+            source = f"{int(mtime * 1e6)}:{os.path.getsize(img_path)}:{IMAGE_DISPLAY_SIZE[0]}x{IMAGE_DISPLAY_SIZE[1]}:{DISPLAY_RESAMPLE.name.lower()}"
+        except OSError:
+            source = None
+        if source is not None:
+            try:
+                img = Image.open(cache_path)
+                if img.text.get("source") == source:
+                    img.load()
+                    os.utime(cache_path)  # mtime doubles as last-used time for pruning
+                    return img
+                img.close()
+            except OSError:
+                pass  # Not cached yet, or a corrupt entry; (re)build it below.
+        img = self._decode_image(img_path)
+        if source is None:
+            return img
+        # Temp name is per thread since the prefetch worker may race the main thread.
+        tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(THUMB_CACHE_DIR, exist_ok=True)
+            info = PngImagePlugin.PngInfo()
+            info.add_text("source", source)
+            img.save(tmp_path, 'PNG', compress_level=1, pnginfo=info)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # The cache is optional, e.g. on a full disk.
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return img
+
+    def _prune_thumb_cache(self):
+        # Runs on a worker thread: remove temp files left by an interrupted
+        # save, then the least recently used previews once the cache grows
+        # past THUMB_CACHE_MAX_BYTES.
+        try:
+            with os.scandir(THUMB_CACHE_DIR) as it:
+                entries = [(st.st_mtime, st.st_size, e.path) for e in it for st in (e.stat(),)]
+            stale_before = time.time() - 60  # leave saves still in flight alone
+            for mtime, _, path in entries:
+                if path.endswith('.tmp') and mtime < stale_before:
+                    os.remove(path)
+            entries = [entry for entry in entries if entry[2].endswith('.png')]
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= THUMB_CACHE_MAX_BYTES: break
+                os.remove(path)
+                total -= size
+        except OSError:
+            pass  # Missing cache folder, or an entry removed concurrently.
+
+    def _prefetch_subfolder(self, idx):
+        # Runs on a worker thread: only decode PIL images here, PhotoImage must
+        # be created on the Tk thread.
+        name = self.subfolders[idx]
+        full_path = os.path.join(self.main_folder_path, name)
+        decoded = {}
+        try:
+            for entry in self._list_image_files(full_path)[:4]:
+                key = (entry.path, entry.stat().st_mtime)
+                if key not in self._photo_cache:
+                    decoded[key] = self._get_thumbnail(*key)
+        except Exception:
+            pass  # Whatever is missing is decoded on the main thread.
+        return decoded
+
+    def _take_prefetched(self, idx):
+        if not self._prefetch_future: return {}
+        name, future = self._prefetch_future
+        if name != self.subfolders[idx]:
+            # Keep a prefetch that still targets the following subfolder, e.g.
+            # when Ctrl+S reloads the current one; drop it otherwise.
+            if idx + 1 >= len(self.subfolders) or name != self.subfolders[idx + 1]:
+                future.cancel()
+                self._prefetch_future = None
+            return {}
+        self._prefetch_future = None
+        # A queued prefetch is cancelled and decoded in parallel instead. One
+        # that is already running (or done) is waited on, since decoding the
+        # same images again would only compete with it.
+        if future.cancel(): return {}
+        return future.result()
+
+    def _decode_in_parallel(self, entries, decoded):
+        # Decode whatever is neither cached nor prefetched concurrently; PIL
+        # releases the GIL while decoding and resampling.
+        jobs = {}
+        for entry in entries:
+            try:
+                key = (entry.path, entry.stat().st_mtime)
+            except OSError:
+                continue
+            if key not in self._photo_cache and key not in decoded:
+                jobs[key] = self._decode_pool.submit(self._get_thumbnail, *key)
+        for key, future in jobs.items():
+            try:
+                decoded[key] = future.result()
+            except Exception:
+                pass  # Retried and reported when the slot is loaded.
+
+    def _get_photo(self, img_path, mtime, prefetched=None):
+        # Keyed by mtime so an image edited on disk is re-read on the next visit.
+        key = (img_path, mtime)
+        cached = self._photo_cache.get(key)
+        if cached is not None:
+            self._photo_cache.move_to_end(key)
+            return cached
+        # Once the cache is full, paste into the evicted PhotoImage instead of
+        # allocating a new Tk pixel buffer. The evicted entry is the least
+        # recently used, so it is not one of the images currently on screen.
+        evicted = None
+        if len(self._photo_cache) >= self._photo_cache_size:
+            _, evicted = self._photo_cache.popitem(last=False)
+        img = prefetched.get(key) if prefetched else None
+        if img is None:
+            img = self._get_thumbnail(*key)
+        # paste() converts to the PhotoImage's original mode, so only reuse a
+        # buffer of the same mode (an 'L' buffer would drop the colour).
+        recycled = evicted[1] if evicted and evicted[0].mode == img.mode else None
+        if recycled is not None:
+            recycled.paste(img)
+            photo = recycled
+        else:
+            photo = ImageTk.PhotoImage(img)
+        entry = (img, photo)
+        self._photo_cache[key] = entry
+        return entry
+
+    def _draw_bboxes(self, canvas, bboxes):
+        # Create every rectangle in a single Tcl script instead of one call per box.
+        # Wrapping the commands in [list ...] returns all new item ids from that
+        # same call, so no find_withtag round trip is needed afterwards.
+        if not len(bboxes): return []
+        script = 'list ' + ' '.join(
+            f'[{canvas._w} create rectangle {x1} {y1} {x2} {y2} -outline {BBOX_COLOR} -width {BBOX_WIDTH} -tags bbox]'
+            for x1, y1, x2, y2 in bboxes.tolist()
+        )
+        return [int(item_id) for item_id in canvas.tk.splitlist(canvas.tk.eval(script))]
 
     def _update_button_states(self):
         has_subfolders = bool(self.subfolders)
-        self.btn_save.config(state=tk.NORMAL if has_subfolders else tk.DISABLED)
-        self.btn_clear.config(state=tk.NORMAL if has_subfolders else tk.DISABLED)
         can_go_next = self.current_subfolder_index < len(self.subfolders) - 1
         can_go_prev = self.current_subfolder_index > 0
-        self.btn_save_next.config(state=tk.NORMAL if can_go_next else tk.DISABLED)
-        self.btn_prev.config(state=tk.NORMAL if can_go_prev else tk.DISABLED)
-        self.btn_undo.config(state=tk.NORMAL if self.undo_stack else tk.DISABLED)
-
-    def _on_canvas_press(self, event, canvas):
+        target_states = {
+            self.btn_save: has_subfolders,
+            self.btn_clear: has_subfolders,
+            self.btn_save_next: can_go_next,
+            self.btn_prev: can_go_prev,
+            self.btn_undo: bool(self.undo_stack),
+        }
+        # Called after every drawn box; only touch Tk for buttons that changed.
+        for button, enabled in target_states.items():
+            if self._last_button_states.get(button) != enabled:
+                button.config(state=tk.NORMAL if enabled else tk.DISABLED)
+                self._last_button_states[button] = enabled
+
+    def _on_canvas_press(self, event):
+        canvas = event.widget
         state = self.canvas_drawing_state.get(canvas)
         if not state or not state.get('image_name'): return
         state['start_x'] = canvas.canvasx(event.x)
         state['start_y'] = canvas.canvasy(event.y)
-        state['active_rect_id'] = canvas.create_rectangle(state['start_x'], state['start_y'], state['start_x'], state['start_y'], outline=BBOX_COLOR, width=BBOX_WIDTH, dash=(4, 2))
+        state['active_rect_id'] = canvas.create_rectangle(state['start_x'], state['start_y'], state['start_x'], state['start_y'], outline=BBOX_COLOR, width=BBOX_WIDTH, dash=(4, 2), tags="drawing")
 
-    def _on_canvas_drag(self, event, canvas):
+    def _on_canvas_drag(self, event):
+        canvas = event.widget
         state = self.canvas_drawing_state.get(canvas)
         if not state or not state.get('active_rect_id'): return
-        cur_x, cur_y = canvas.canvasx(event.x), canvas.canvasy(event.y)
-        canvas.coords(state['active_rect_id'], state['start_x'], state['start_y'], cur_x, cur_y)
+        # B1-Motion fires at the mouse polling rate. Only remember the latest
+        # position and let a single pending callback apply it: on the next idle
+        # pass, or once ~1/60 s has elapsed since the last redraw.
+        state['pending_xy'] = (canvas.canvasx(event.x), canvas.canvasy(event.y))
+        if state.get('raf_id') is None:
+            wait_ms = int((self._drag_interval - (time.monotonic() - self._last_drag_time)) * 1000)
+            if wait_ms > 0:
+                state['raf_id'] = canvas.after(wait_ms, self._flush_drag, canvas)
+            else:
+                state['raf_id'] = canvas.after_idle(self._flush_drag, canvas)
 
-    def _on_canvas_release(self, event, canvas):
+    def _flush_drag(self, canvas):
+        state = self.canvas_drawing_state.get(canvas)
+        if not state: return
+        state['raf_id'] = None
+        pending_xy = state.pop('pending_xy', None)
+        if not pending_xy or not state.get('active_rect_id'): return
+        self._last_drag_time = time.monotonic()
+        canvas.coords(state['active_rect_id'], state['start_x'], state['start_y'], *pending_xy)
+
+    def _on_canvas_release(self, event):
+        canvas = event.widget
         state = self.canvas_drawing_state.get(canvas)
         if not state or not state.get('active_rect_id'): return
         
@@ -362,13 +636,17 @@ class AnnotationApp:
         
         x1, y1 = state['start_x'], state['start_y']
         x2, y2 = canvas.canvasx(event.x), canvas.canvasy(event.y)
-        bbox = [int(min(x1, x2)), int(min(y1, y2)), int(max(x1, x2)), int(max(y1, y2))]
+        arr = np.array([min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)], dtype=np.int32)
+        # Keep boxes dragged past the edge inside the displayed image.
+        np.clip(arr, 0, self._bbox_max, out=arr)
 
-        if bbox[2] - bbox[0] < 5 or bbox[3] - bbox[1] < 5: return
+        if arr[2] - arr[0] < 5 or arr[3] - arr[1] < 5: return
+        bbox = arr.tolist()
 
         img_name = state['image_name']
-        self.current_subfolder_active_annotations.setdefault(img_name, []).append(bbox)
-        rect_id = canvas.create_rectangle(bbox, outline=BBOX_COLOR, width=BBOX_WIDTH)
+        bboxes = self.current_subfolder_active_annotations.get(img_name, np.empty((0, 4), dtype=np.int32))
+        self.current_subfolder_active_annotations[img_name] = np.vstack((bboxes, arr))
+        rect_id = canvas.create_rectangle(bbox, outline=BBOX_COLOR, width=BBOX_WIDTH, tags="bbox")
         self.drawn_bbox_ids_on_canvas.setdefault(img_name, []).append(rect_id)
         self.undo_stack.append((canvas, img_name))
         
@@ -378,20 +656,31 @@ class AnnotationApp:
     def _action_save_annotations(self, called_from_next=False):
         if not self.current_subfolder_name: return False
 
-        # --- FIX: Use .copy() to prevent overwriting saved data ---
-        # By creating a shallow copy, we ensure that the dictionary stored in
-        # self.annotations_data is a separate object from the one being actively
-        # used and cleared (self.current_subfolder_active_annotations).
+        # The saved record takes the current dict and a shallow copy is kept
+        # for editing, since the next load can return early (e.g. on the last
+        # subfolder) and further edits must not leak into the saved record.
+        # Bbox arrays are never mutated in place, so they can be shared, and
+        # they are converted to lists only when the file is written.
         self.annotations_data[self.current_subfolder_name] = {
             "type_of_annotation": self.annotation_type_var.get(),
-            "annotations": self.current_subfolder_active_annotations.copy()
+            "annotations": self.current_subfolder_active_annotations
         }
-        self._write_json_file(ANNOTATIONS_FILE, self.annotations_data)
-        
+        self.current_subfolder_active_annotations = dict(self.current_subfolder_active_annotations)
         completed = self.progress_data.setdefault("completed_subfolders", [])
         if self.current_subfolder_name not in completed:
             completed.append(self.current_subfolder_name)
-        self._write_json_file(PROGRESS_FILE, self.progress_data)
+        # Only this subfolder's file is rewritten, not the whole dataset.
+        self._dirty_files[self._annotation_file_path(self.current_subfolder_name)] = self.annotations_data[self.current_subfolder_name]
+        # Adjust the per-type counts for this subfolder only instead of recounting.
+        old_type = self.annotation_index.get(self.current_subfolder_name)
+        new_type = self.annotation_type_var.get()
+        if old_type != new_type:
+            if old_type: self._type_counts[old_type] -= 1
+            if new_type: self._type_counts[new_type] += 1
+        self.annotation_index[self.current_subfolder_name] = new_type
+        self._dirty_files[ANNOTATION_INDEX_FILE] = self.annotation_index
+        self._dirty_files[PROGRESS_FILE] = self.progress_data
+        self._schedule_flush()
         
         self.unsaved_changes = False
         self._update_annotation_counts()
@@ -405,14 +694,20 @@ class AnnotationApp:
             self._load_subfolder_by_index(self.current_subfolder_index + 1)
 
     def _action_clear_current_annotations(self):
+        if not any(len(bboxes) for bboxes in self.current_subfolder_active_annotations.values()):
+            self._update_status("No boxes to clear in this subfolder.")
+            return
         if messagebox.askyesno("Confirm Clear", "Clear all boxes for this subfolder?"):
-            img_names_to_clear = list(self.current_subfolder_active_annotations.keys())
-            for img_name in img_names_to_clear:
-                self.current_subfolder_active_annotations[img_name] = []
-            
-            # Redraw the current subfolder to reflect cleared state
-            self._load_subfolder_by_index(self.current_subfolder_index)
+            # One tagged delete per canvas instead of one per rectangle.
+            for canvas in self.image_canvases:
+                canvas.delete("bbox")
+            for img_name in self.current_subfolder_active_annotations:
+                self.current_subfolder_active_annotations[img_name] = np.empty((0, 4), dtype=np.int32)
+            for img_name in self.drawn_bbox_ids_on_canvas:
+                self.drawn_bbox_ids_on_canvas[img_name] = []
+            self.undo_stack.clear()
             self.unsaved_changes = True
+            self._update_button_states()
 
     def _action_undo_last_bbox(self):
         if not self.undo_stack: return
@@ -420,8 +715,9 @@ class AnnotationApp:
         if self.drawn_bbox_ids_on_canvas.get(img_name):
             rect_id = self.drawn_bbox_ids_on_canvas[img_name].pop()
             canvas.delete(rect_id)
-        if self.current_subfolder_active_annotations.get(img_name):
-            self.current_subfolder_active_annotations[img_name].pop()
+        bboxes = self.current_subfolder_active_annotations.get(img_name)
+        if bboxes is not None and len(bboxes):
+            self.current_subfolder_active_annotations[img_name] = bboxes[:-1]
         self.unsaved_changes = True
         self._update_button_states()
 
@@ -433,57 +729,189 @@ class AnnotationApp:
     def _load_annotation_types(self):
         default_types = ["paragraphs", "tables", "images", "headings", "other"]
         try:
+            types = None
             if os.path.exists(ANNOTATION_TYPES_FILE):
                 with open(ANNOTATION_TYPES_FILE, 'r') as f:
                     types = json.load(f)
-                    if isinstance(types, list):
-                        self.annotation_types = types
-                        return
-            self.annotation_types = default_types
-            self._save_annotation_types()
+            if isinstance(types, list):
+                self.annotation_types = types
+            else:
+                self.annotation_types = default_types
+                self._save_annotation_types()
         except Exception:
             self.annotation_types = default_types
+        self._annotation_types_set = set(self.annotation_types)
 
     def _save_annotation_types(self):
+        self._annotation_types_set = set(self.annotation_types)
         self._write_json_file(ANNOTATION_TYPES_FILE, self.annotation_types)
 
     def _read_json_file(self, file_path, default_val):
         if not os.path.exists(file_path): return default_val
         try:
+            if orjson:
+                # Parse straight from a read-only mapping instead of reading the
+                # whole file into a bytes object first.
+                with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view: return orjson.loads(view)
             with open(file_path, 'r') as f: return json.load(f)
-        except (json.JSONDecodeError, IOError):
+        except (json.JSONDecodeError, IOError, ValueError):  # ValueError: mmap of an empty file
             return default_val
 
+    def _annotation_file_path(self, subfolder_name):
+        return os.path.join(ANNOTATIONS_DIR, f"{subfolder_name}.json")
+
+    def _get_subfolder_annotations(self, subfolder_name):
+        # Bboxes are only read from disk the first time a subfolder is shown.
+        # The file is tried even when the index lacks the subfolder: the index
+        # and the per-subfolder file are written separately, so the index may
+        # be stale after a crash or a failed write.
+        if subfolder_name not in self.annotations_data:
+            data = self._read_json_file(self._annotation_file_path(subfolder_name), None)
+            if data is None:
+                data = {}
+            elif subfolder_name not in self.annotation_index:
+                self._repair_annotation_index(subfolder_name, data.get("type_of_annotation"))
+            self.annotations_data[subfolder_name] = data
+        return self.annotations_data[subfolder_name]
+
+    def _repair_annotation_index(self, subfolder_name, type_name):
+        self.annotation_index[subfolder_name] = type_name
+        if type_name:
+            self._type_counts[type_name] += 1
+            self._update_annotation_counts()
+        self._dirty_files[ANNOTATION_INDEX_FILE] = self.annotation_index
+        self._schedule_flush()
+
     def _load_annotations_from_file(self):
-        self.annotations_data = self._read_json_file(ANNOTATIONS_FILE, {})
+        # Startup only reads the small type index; bboxes are loaded per subfolder.
+        self.annotations_data = {}
+        self.annotation_index = self._read_json_file(ANNOTATION_INDEX_FILE, None)
+        if self.annotation_index is None:
+            self._rebuild_annotation_index()
+        else:
+            self._reconcile_annotation_index()
+        self._type_counts = Counter(t for t in self.annotation_index.values() if t)
         self._update_annotation_counts()
 
+    def _reconcile_annotation_index(self):
+        # Listing the directory is cheap; only subfolder files the index is
+        # missing (a write interrupted between the two files) are read.
+        if not os.path.isdir(ANNOTATIONS_DIR): return
+        with os.scandir(ANNOTATIONS_DIR) as it:
+            missing = [e for e in it if e.is_file() and e.name.endswith('.json') and e.name[:-len('.json')] not in self.annotation_index]
+        for e in missing:
+            name = e.name[:-len('.json')]
+            data = self._read_json_file(e.path, {})
+            self.annotations_data[name] = data
+            self.annotation_index[name] = data.get("type_of_annotation")
+        if missing:
+            self._dirty_files[ANNOTATION_INDEX_FILE] = self.annotation_index
+            self._flush_dirty(background=False)
+
+    def _rebuild_annotation_index(self):
+        if os.path.isdir(ANNOTATIONS_DIR):
+            with os.scandir(ANNOTATIONS_DIR) as it:
+                for e in it:
+                    if e.is_file() and e.name.endswith('.json'):
+                        self.annotations_data[e.name[:-len('.json')]] = self._read_json_file(e.path, {})
+        elif os.path.exists(ANNOTATIONS_FILE):
+            # Split an old single-file annotations.json into per-subfolder files.
+            self.annotations_data = self._read_json_file(ANNOTATIONS_FILE, {})
+            for name, record in self.annotations_data.items():
+                self._dirty_files[self._annotation_file_path(name)] = record
+        self.annotation_index = {name: record.get("type_of_annotation") for name, record in self.annotations_data.items()}
+        self._dirty_files[ANNOTATION_INDEX_FILE] = self.annotation_index
+        self._flush_dirty(background=False)
+
     def _load_progress_from_file(self):
         self.progress_data = self._read_json_file(PROGRESS_FILE, {"completed_subfolders": []})
 
-    def _write_json_file(self, file_path, data):
+    def _dump_json_file(self, file_path, data, generation=None):
+        # May run on a worker thread, so it raises instead of touching Tk.
+        with self._file_locks[file_path]:
+            os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+            # A slower write of an older snapshot must not overwrite a newer one.
+            if generation is not None:
+                if generation <= self._written_generation.get(file_path, 0): return
+                self._written_generation[file_path] = generation
+            # Write to a temp file and swap it in so a crash never truncates the target.
+            tmp_path = file_path + '.tmp'
+            with open(tmp_path, 'wb' if orjson else 'w') as f:
+                if orjson:
+                    f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
+                else:
+                    json.dump(data, f, separators=(',', ':'), default=_json_default)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+
+    def _write_json_file(self, file_path, data, generation=None):
         try:
-            with open(file_path, 'w') as f: json.dump(data, f, indent=4)
+            self._dump_json_file(file_path, data, generation)
         except IOError as e:
             messagebox.showerror("Error", f"Could not save to {file_path}: {e}")
 
+    def _schedule_flush(self):
+        # Saves in quick succession (e.g. Save & Next) collapse into one write.
+        if self._pending_save_after_id:
+            self.root.after_cancel(self._pending_save_after_id)
+        self._pending_save_after_id = self.root.after(SAVE_DEBOUNCE_MS, self._flush_dirty)
+
+    def _flush_dirty(self, background=True):
+        if self._pending_save_after_id:
+            self.root.after_cancel(self._pending_save_after_id)
+            self._pending_save_after_id = None
+        for file_path, data in self._dirty_files.items():
+            self._write_generation += 1
+            self._file_locks.setdefault(file_path, threading.Lock())
+            if background:
+                # Serialize a snapshot off the Tk thread; edits continue on the live data.
+                snapshot = copy.deepcopy(data)
+                future = self._prefetch_pool.submit(self._dump_json_file, file_path, snapshot, self._write_generation)
+                self._pending_writes.append((file_path, future))
+            else:
+                self._write_json_file(file_path, data, self._write_generation)
+        self._dirty_files.clear()
+        if self._pending_writes and not self._poll_writes_after_id:
+            self._poll_writes_after_id = self.root.after(100, self._poll_pending_writes)
+
+    def _poll_pending_writes(self):
+        # Report background write failures from the Tk thread.
+        self._poll_writes_after_id = None
+        still_pending = []
+        for file_path, future in self._pending_writes:
+            if not future.done():
+                still_pending.append((file_path, future))
+            elif future.exception():
+                messagebox.showerror("Error", f"Could not save to {file_path}: {future.exception()}")
+        self._pending_writes = still_pending
+        if still_pending:
+            self._poll_writes_after_id = self.root.after(100, self._poll_pending_writes)
+
     def _update_annotation_counts(self):
-        if not hasattr(self, 'count_labels'): return # Guard against early calls
-        counts = Counter(v.get("type_of_annotation") for v in self.annotations_data.values() if v.get("type_of_annotation"))
+        if not getattr(self, 'count_labels', None): return # Guard against early calls and an empty type list
         for type_name, label in self.count_labels.items():
-            label.config(text=str(counts.get(type_name, 0)))
+            label.config(text=str(self._type_counts.get(type_name, 0)))
 
     def _on_app_close(self):
         if self.unsaved_changes:
             choice = ExitDialog(self.root).get_choice()
             if choice == "save_exit":
                 if self._action_save_annotations():
-                    self.root.destroy()
+                    self._shutdown()
             elif choice == "exit_no_save":
-                self.root.destroy()
+                self._shutdown()
             # if "cancel", do nothing
         else:
-            self.root.destroy()
+            self._shutdown()
+
+    def _shutdown(self):
+        self._flush_dirty(background=False)
+        wait([future for _, future in self._pending_writes])
+        self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+        self._decode_pool.shutdown(wait=False)
+        self.root.destroy()
 
 if __name__ == "__main__":
     root = tk.Tk()